@@ -0,0 +1,44 @@
+#
+# Copyright (c) 2021 Nitric Technologies Pty Ltd.
+#
+# This file is part of Nitric Python 3 SDK.
+# See https://github.com/nitrictech/python-sdk for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+from typing import Any, Callable
+
+# Request bodies are always decoded with the standard library, which accepts bytes directly. orjson decodes some
+#   valid bodies differently, integers larger than 64 bits lose precision and NaN, Infinity or lone surrogates fail.
+loads: Callable[[bytes | str], Any] = json.loads
+
+# orjson is an optional dependency (pip install nitric[orjson]), when it's installed it's used to encode response
+#   bodies. orjson output differs slightly, it uses compact separators and encodes NaN/Infinity as null.
+try:
+    import orjson
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON bytes."""
+        try:
+            # non-string keys are allowed to match the behavior of json.dumps
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # values orjson rejects but json supports, e.g. integers larger than 64 bits.
+            return json.dumps(obj).encode("utf-8")
+
+except ImportError:
+
+    def dumps_bytes(obj: Any) -> bytes:
+        """Serialize obj to UTF-8 encoded JSON bytes."""
+        return json.dumps(obj).encode("utf-8")
@@ -18,14 +18,11 @@
 #
 from __future__ import annotations
 
-import functools
 import inspect
-import json
-from abc import ABC, abstractmethod
-from enum import Enum
-from typing import Any, Dict, Generic, List, Optional, Protocol, TypeVar, Union
-
-from opentelemetry import propagate
+import sys
+import weakref
+from enum import StrEnum
+from typing import Any, Callable, Dict, Generic, List, Optional, Protocol, TypeVar, Union
 
 from nitric.proto.schedules.v1 import ServerMessage as ScheduleServerMessage
 from nitric.proto.topics.v1 import ClientMessage as TopicClientMessage
@@ -36,13 +33,14 @@ from nitric.proto.batch.v1 import (
     ClientMessage as BatchClientMessage,
     JobResponse as BatchJobResponse,
 )
+from nitric import _json
 from nitric.utils import dict_from_struct
 
 Record = Dict[str, Union[str, List[str]]]
-PROPAGATOR = propagate.get_global_textmap()
+_MISSING: Any = object()
 
 
-class HttpMethod(Enum):
+class HttpMethod(StrEnum):
     """Valid query expression operators."""
 
     GET = "GET"
@@ -52,9 +50,6 @@ class HttpMethod(Enum):
     PATCH = "PATCH"
     OPTIONS = "OPTIONS"
 
-    def __str__(self):
-        return str(self.value)
-
 
 class TriggerContext(Protocol):
     """Represents an abstract request/response context for any trigger."""
@@ -75,6 +70,8 @@ class TriggerContext(Protocol):
 class HttpRequest:
     """Represents a translated Http Request forwarded from the Nitric Membrane."""
 
+    __slots__ = ("_data", "method", "path", "params", "query", "headers", "_json_cache", "_body_cache")
+
     def __init__(
         self,
         data: bytes,
@@ -92,30 +89,68 @@ class HttpRequest:
         self.query = query
         self.headers = headers
 
+    @property
+    def data(self) -> bytes:
+        """Get the raw body of the request."""
+        return self._data
+
+    @data.setter
+    def data(self, value: bytes):
+        # Decoded views of the body are cached, so they must be reset whenever the raw body changes.
+        self._data = value
+        self._json_cache: Any = _MISSING
+        self._body_cache: Optional[str] = None
+
     @property
     def json(self) -> Optional[Any]:
         """Get the body of the request as JSON, returns None if request body is not JSON."""
-        try:
-            return json.loads(self.body)
-        except json.JSONDecodeError:
-            return None
-        except TypeError:
-            return None
+        if self._json_cache is _MISSING:
+            if not self._data:
+                # requests without a body, e.g. most GETs, can't be JSON, so skip raising and handling a decode error.
+                self._json_cache = None
+            else:
+                try:
+                    # loads accepts bytes directly, avoiding an intermediate str copy of the body.
+                    self._json_cache = _json.loads(self._data)
+                except (ValueError, TypeError):
+                    self._json_cache = None
+        return self._json_cache
 
     @property
-    def body(self):
+    def body(self) -> str:
         """Get the body of the request as text."""
-        return self.data.decode("utf-8")
+        if self._body_cache is None:
+            self._body_cache = self._data.decode("utf-8")
+        return self._body_cache
 
 
 class HttpResponse:
     """Represents an HTTP Response to be generated by the Nitric Membrane in response to an HTTP Request Trigger."""
 
+    __slots__ = ("status", "_headers", "_body")
+
     def __init__(self, status: int = 200, headers: Optional[Record] = None, body: Optional[bytes] = None):
         """Construct a new HttpResponse."""
         self.status = status
-        self.headers = headers if headers else {}
-        self._body = body if body else bytes()
+        # headers are allocated the first time they're accessed, most responses never set any.
+        self._headers = headers
+        self._body = body if body else b""
+
+    @property
+    def headers(self) -> Record:
+        """Return the HTTP response headers."""
+        if self._headers is None:
+            self._headers = {}
+        return self._headers
+
+    @headers.setter
+    def headers(self, value: Record):
+        self._headers = value
+
+    @property
+    def has_headers(self) -> bool:
+        """Return True if any headers have been set, without allocating the headers when they haven't."""
+        return bool(self._headers)
 
     @property
     def body(self):
@@ -129,13 +164,15 @@ class HttpResponse:
         elif isinstance(value, bytes):
             self._body = value
         else:
-            self._body = json.dumps(value).encode("utf-8")
+            self._body = _json.dumps_bytes(value)
             self.headers["Content-Type"] = ["application/json"]
 
 
 class HttpContext:
     """Represents the full request/response context for an Http based trigger."""
 
+    __slots__ = ("req", "res")
+
     def __init__(self, request: HttpRequest, response: Optional[HttpResponse] = None):
         """Construct a new HttpContext."""
         self.req = request
@@ -143,12 +180,14 @@ class HttpContext:
 
     @staticmethod
     def _ensure_value_is_list(value: Union[str, List[str]]) -> List[str]:
-        return list(value) if isinstance(value, list) else [value]
+        return value if isinstance(value, list) else [value]
 
 
 class MessageRequest:
     """Represents a translated Event, from a Subscribed Topic, forwarded from the Nitric Membrane."""
 
+    __slots__ = ("data", "topic")
+
     data: dict[str, Any]
     topic: str
 
@@ -161,6 +200,8 @@ class MessageRequest:
 class MessageResponse:
     """Represents the response to a trigger from an Event as a result of a Topic subscription."""
 
+    __slots__ = ("success",)
+
     def __init__(self, success: bool = True):
         """Construct a new EventResponse."""
         self.success = success
@@ -169,6 +210,8 @@ class MessageResponse:
 class MessageContext:
     """Represents the full request/response context for an Event based trigger."""
 
+    __slots__ = ("req", "res")
+
     def __init__(self, request: MessageRequest, response: Optional[MessageResponse] = None):
         """Construct a new EventContext."""
         self.req = request
@@ -177,10 +220,12 @@ class MessageContext:
     @staticmethod
     def _from_request(msg: TopicServerMessage) -> MessageContext:
         """Construct a new EventContext from a Topic trigger from the Nitric Membrane."""
+        message_request = msg.message_request
         return MessageContext(
             request=MessageRequest(
-                data=dict_from_struct(msg.message_request.message.struct_payload),
-                topic=msg.message_request.topic_name,
+                data=dict_from_struct(message_request.message.struct_payload),
+                # topic names come from a small fixed set, interning them makes comparisons against them cheap.
+                topic=sys.intern(message_request.topic_name),
             )
         )
 
@@ -195,6 +240,8 @@ class MessageContext:
 class WebsocketRequest:
     """Represents an incoming websocket event."""
 
+    __slots__ = ("connection_id",)
+
     def __init__(self, connection_id: str):
         """Construct a new WebsocketRequest."""
         self.connection_id = connection_id
@@ -203,6 +250,8 @@ class WebsocketRequest:
 class WebsocketConnectionRequest(WebsocketRequest):
     """Represents an incoming websocket connection."""
 
+    __slots__ = ("query",)
+
     query: Dict[str, str | List[str]]
 
     def __init__(self, connection_id: str, query: Dict[str, str | List[str]]):
@@ -214,6 +263,8 @@ class WebsocketConnectionRequest(WebsocketRequest):
 class WebsocketMessageRequest(WebsocketRequest):
     """Represents an incoming websocket message."""
 
+    __slots__ = ("data",)
+
     data: bytes
 
     def __init__(self, connection_id: str, data: bytes):
@@ -225,6 +276,8 @@ class WebsocketMessageRequest(WebsocketRequest):
 class WebsocketResponse:
     """Represents a response to a websocket event."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Construct a new WebsocketResponse."""
 
@@ -232,6 +285,8 @@ class WebsocketResponse:
 class WebsocketConnectionResponse(WebsocketResponse):
     """Represents a response to a websocket connection event."""
 
+    __slots__ = ("reject",)
+
     reject: bool
 
     def __init__(self, reject: bool = False):
@@ -246,6 +301,8 @@ AnyWebsocketResponse = Union[WebsocketResponse, WebsocketConnectionResponse]
 class WebsocketContext:
     """Represents the full request/response context for a Websocket based trigger."""
 
+    __slots__ = ("req", "res")
+
     def __init__(self, request: AnyWebsocketRequest, response: Optional[AnyWebsocketResponse] = None):
         """Construct a new WebsocketContext."""
         self.req = request
@@ -263,6 +320,8 @@ class WebsocketContext:
 class IntervalRequest:
     """Represents a translated Event, from a Schedule, forwarded from the Nitric Membrane."""
 
+    __slots__ = ("schedule_name",)
+
     def __init__(self, schedule_name: str):
         """Construct a new IntervalRequest."""
         self.schedule_name = schedule_name
@@ -271,6 +330,8 @@ class IntervalRequest:
 class IntervalResponse:
     """Represents the response to a trigger from an Interval as a result of a Schedule."""
 
+    __slots__ = ("_request_id",)
+
     _request_id: str
 
     def __init__(self, request_id: str):
@@ -281,6 +342,8 @@ class IntervalResponse:
 class IntervalContext:
     """Represents the full request/response context for a scheduled trigger."""
 
+    __slots__ = ("req", "res")
+
     def __init__(self, msg: ScheduleServerMessage):
         """Construct a new EventContext."""
         self.req = IntervalRequest(schedule_name=msg.interval_request.schedule_name)
@@ -316,6 +379,9 @@ EventHandler = Handler[MessageContext]
 IntervalHandler = Handler[IntervalContext]
 WebsocketHandler = Handler[WebsocketContext]
 
+# Results of _is_handler, keyed weakly so cached functions can still be garbage collected.
+_HANDLER_CACHE: weakref.WeakKeyDictionary[Any, bool] = weakref.WeakKeyDictionary()
+
 
 def _convert_to_middleware(handler: Handler[C] | Middleware[C]) -> Middleware[C]:
     """Convert a handler to a middleware, if it's already a middleware it's returned unchanged."""
@@ -332,12 +398,54 @@ def _convert_to_middleware(handler: Handler[C] | Middleware[C]) -> Middleware[C]
 
 def _is_handler(unknown: Middleware[C] | Handler[C]) -> bool:
     """Return True if the provided function is a handler (1 positional arg)."""
-    signature = inspect.signature(unknown)
-    params = signature.parameters
-    positional = [name for name, param in params.items() if param.default == inspect.Parameter.empty]
+    try:
+        return _HANDLER_CACHE[unknown]
+    except KeyError:
+        pass
+    except TypeError:
+        # callables that can't be weakly referenced or hashed are inspected every time.
+        return _inspect_is_handler(unknown)
+
+    is_handler = _inspect_is_handler(unknown)
+    _HANDLER_CACHE[unknown] = is_handler
+    return is_handler
+
+
+def _inspect_is_handler(unknown: Middleware[C] | Handler[C]) -> bool:
+    params = inspect.signature(unknown).parameters
+    positional = [name for name, param in params.items() if param.default is inspect.Parameter.empty]
     return len(positional) == 1
 
 
+def _link_middleware(chain: List[Middleware[C]], last: Optional[Middleware[C]]) -> Optional[Middleware[C]]:
+    """Link the chain of middleware together, so each calls the next, with the final middleware calling last."""
+    link = last
+    for cur in reversed(chain):
+        link = _chained_middleware(cur, lambda following=link: following)  # type: ignore
+    return link
+
+
+def _link_middleware_from(chain: List[Middleware[C]], index: int, last: Middleware[C]) -> Middleware[C]:
+    """Return the link that calls chain[index], each following link is only created once the chain reaches it."""
+    if index == len(chain):
+        return last
+    return _chained_middleware(chain[index], lambda: _link_middleware_from(chain, index + 1, last))
+
+
+def _chained_middleware(cur: Middleware[C], next_link: Callable[[], Optional[Middleware[C]]]) -> Middleware[C]:
+    """Wrap cur as a link in a middleware chain, next_link returns the link cur should call next."""
+
+    async def chained_middleware(ctx: C, nxt: Optional[Middleware[C]] = None) -> C:
+        result = (await nxt(ctx)) if nxt is not None else ctx  # type: ignore
+        # type ignored because mypy appears to misidentify the correct return type
+        output_context = await cur(result, next_link())  # type: ignore
+        if not output_context:
+            return result  # type: ignore
+        return output_context  # type: ignore
+
+    return chained_middleware  # type: ignore
+
+
 def compose_middleware(*middlewares: Middleware[C] | Handler[C]) -> Middleware[C]:
     """
     Compose multiple middleware functions into a single middleware function.
@@ -345,23 +453,13 @@ def compose_middleware(*middlewares: Middleware[C] | Handler[C]) -> Middleware[C
     The resulting middleware will effectively be a chain of the provided middleware,
     where each calls the next in the chain when they're successful.
     """
-    middlewares = [_convert_to_middleware(middleware) for middleware in middlewares]  # type: ignore
+    chain = [_convert_to_middleware(middleware) for middleware in middlewares]
+    # the chain only depends on nxt through its final link, so when there's no nxt it can be built once, up front.
+    #   when composed is nested in another chain it receives an nxt, links are then created as the chain reaches them.
+    unbound_chain = _link_middleware(chain, None)
 
     async def composed(ctx: C, nxt: Optional[Middleware[C]] = None) -> C:
-        last_middleware = nxt
-
-        def reduce_chain(acc_next: Middleware[C], cur: Middleware[C]) -> Middleware[C]:
-            async def chained_middleware(ctx: C, nxt: Optional[Middleware[C]] = None) -> C:
-                result = (await nxt(ctx)) if nxt is not None else ctx  # type: ignore
-                # type ignored because mypy appears to misidentify the correct return type
-                output_context = await cur(result, acc_next)  # type: ignore
-                if not output_context:
-                    return result  # type: ignore
-                return output_context  # type: ignore
-
-            return chained_middleware
-
-        middleware_chain = functools.reduce(reduce_chain, reversed(middlewares), last_middleware)  # type: ignore
+        middleware_chain = unbound_chain if nxt is None else _link_middleware_from(chain, 0, nxt)
         # type ignored because mypy appears to misidentify the correct return type
         return await middleware_chain(ctx)  # type: ignore
 
@@ -371,6 +469,8 @@ def compose_middleware(*middlewares: Middleware[C] | Handler[C]) -> Middleware[C
 class JobRequest:
     """Represents a translated Job, from a Job Definition, forwarded from the Nitric Runtime Server."""
 
+    __slots__ = ("data",)
+
     data: dict[str, Any]
 
     def __init__(self, data: dict[str, Any]):
@@ -381,6 +481,8 @@ class JobRequest:
 class JobResponse:
     """Represents the response to a trigger from a Job submission as a result of a SubmitJob call."""
 
+    __slots__ = ("success",)
+
     def __init__(self, success: bool = True):
         """Construct a new EventResponse."""
         self.success = success
@@ -389,6 +491,8 @@ class JobResponse:
 class JobContext:
     """Represents the full request/response context for an Event based trigger."""
 
+    __slots__ = ("req", "res")
+
     def __init__(self, request: JobRequest, response: Optional[JobResponse] = None):
         """Construct a new EventContext."""
         self.req = request
@@ -404,9 +508,9 @@ class JobContext:
         return BatchClientMessage(job_response=BatchJobResponse(success=self.res.success))
 
 
-class FunctionServer(ABC):
+class FunctionServer:
     """Represents a worker that should be started at runtime."""
 
-    @abstractmethod
     async def start(self) -> None:
         """Start the worker."""
+        raise NotImplementedError()
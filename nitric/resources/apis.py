@@ -423,10 +423,11 @@ def _http_context_to_proto_response(ctx: HttpContext) -> ProtoHttpResponse:
     """Construct a HttpResponse for the Nitric Membrane from this context object."""
     body = ctx.res.body if ctx.res.body else bytes()
     headers: Dict[str, HeaderValue] = {}
-    for k, v in ctx.res.headers.items():
-        hv = HeaderValue()
-        hv.value = HttpContext._ensure_value_is_list(v)  # pylint: disable=protected-access
-        headers[k] = hv
+    if ctx.res.has_headers:
+        for k, v in ctx.res.headers.items():
+            hv = HeaderValue()
+            hv.value = HttpContext._ensure_value_is_list(v)  # pylint: disable=protected-access
+            headers[k] = hv
 
     return ProtoHttpResponse(
         status=ctx.res.status,
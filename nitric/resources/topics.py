@@ -19,6 +19,7 @@
 from __future__ import annotations
 
 import logging
+import sys
 from typing import Any, Callable, List, Literal
 
 import betterproto
@@ -133,7 +134,7 @@ def _message_context_from_proto(msg: ProtoMessageRequest) -> MessageContext:
     return MessageContext(
         request=MessageRequest(
             data=dict_from_struct(msg.message.struct_payload),
-            topic=msg.topic_name,
+            topic=sys.intern(msg.topic_name),
         )
     )
 
@@ -19,7 +19,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Callable, Literal
+from typing import Callable, Dict, Literal
 
 import betterproto
 import grpclib
@@ -29,6 +29,7 @@ from grpclib.client import Channel
 from nitric.application import Nitric
 from nitric.bidi import AsyncNotifierList
 from nitric.context import (
+    AnyWebsocketRequest,
     FunctionServer,
     Record,
     WebsocketConnectionRequest,
@@ -152,21 +153,27 @@ def websocket(name: str) -> Websocket:
     return Nitric._create_resource(Websocket, name)  # type: ignore pylint: disable=protected-access
 
 
-def _websocket_context_from_proto(msg: WebsocketEventRequest) -> WebsocketContext:
-    """Construct a new WebsocketContext from a websocket trigger from the Nitric Server."""
+def _websocket_connection_request_from_proto(msg: WebsocketEventRequest) -> WebsocketConnectionRequest:
     query: Record = {k: v.value for (k, v) in msg.connection.query_params.items()}
+    return WebsocketConnectionRequest(connection_id=msg.connection_id, query=query)
+
+
+def _websocket_message_request_from_proto(msg: WebsocketEventRequest) -> WebsocketMessageRequest:
+    return WebsocketMessageRequest(connection_id=msg.connection_id, data=msg.message.body)
+
 
-    req = WebsocketRequest(
-        connection_id=msg.connection_id,
-    )
+# Request builders for each websocket_event type, other events (e.g. disconnect) only carry the connection id.
+_WEBSOCKET_REQUEST_BUILDERS: Dict[str, Callable[[WebsocketEventRequest], AnyWebsocketRequest]] = {
+    "connection": _websocket_connection_request_from_proto,
+    "message": _websocket_message_request_from_proto,
+}
+
+
+def _websocket_context_from_proto(msg: WebsocketEventRequest) -> WebsocketContext:
+    """Construct a new WebsocketContext from a websocket trigger from the Nitric Server."""
     evt_type, _ = betterproto.which_one_of(msg, "websocket_event")
-    if evt_type == "connection":
-        req = WebsocketConnectionRequest(
-            connection_id=msg.connection_id,
-            query=query,
-        )
-    if evt_type == "message":
-        req = WebsocketMessageRequest(connection_id=msg.connection_id, data=msg.message.body)
+    builder = _WEBSOCKET_REQUEST_BUILDERS.get(evt_type)
+    req = builder(msg) if builder else WebsocketRequest(connection_id=msg.connection_id)
 
     return WebsocketContext(request=req)
 
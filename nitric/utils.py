@@ -18,8 +18,8 @@
 #
 from typing import Any, Optional
 
-from betterproto.lib.google.protobuf import Struct
-from google.protobuf.json_format import MessageToDict
+import betterproto
+from betterproto.lib.google.protobuf import Struct, Value
 from google.protobuf.struct_pb2 import Struct as WorkingStruct
 
 
@@ -28,13 +28,23 @@ from google.protobuf.struct_pb2 import Struct as WorkingStruct
 #   it relies on Message meta information, that isn't available for dynamic structs.
 def dict_from_struct(struct: Optional[Struct]) -> dict[Any, Any]:
     """Construct a dict from a Struct."""
-    # Convert the bytes representation of the betterproto Struct into a protobuf Struct
-    # in order to use the MessageToDict function to safely create a dict.
+    # Walk the already decoded betterproto Struct directly, rather than re-serializing it
+    #   into a protobuf Struct for MessageToDict, the output is the same in both cases.
     if struct is None:
         return {}
-    gpb_struct = WorkingStruct()
-    gpb_struct.ParseFromString(bytes(struct))
-    return MessageToDict(gpb_struct)
+    return {key: _value_to_python(value) for key, value in struct.fields.items()}
+
+
+def _value_to_python(value: Value) -> Any:
+    """Convert a Struct Value to its python equivalent, following the proto3 JSON mapping."""
+    kind, kind_value = betterproto.which_one_of(value, "kind")
+    if kind == "struct_value":
+        return {key: _value_to_python(inner) for key, inner in kind_value.fields.items()}  # type: ignore
+    if kind == "list_value":
+        return [_value_to_python(inner) for inner in kind_value.values]  # type: ignore
+    if kind == "null_value" or not kind:
+        return None
+    return kind_value
 
 
 def struct_from_dict(dictionary: Optional[dict[Any, Any]]) -> Struct:
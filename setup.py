@@ -52,6 +52,7 @@ setuptools.setup(
         "opentelemetry-instrumentation-grpc",
     ],
     extras_require={
+        "orjson": ["orjson"],
         "dev": [
             "tox==3.20.1",
             "twine==3.2.0",
@@ -74,7 +75,7 @@ setuptools.setup(
             "grpcio-tools==1.62.0",
             "twine==3.2.0",
             "mypy==1.3.0",
-        ]
+        ],
     },
     python_requires=">=3.11",
 )
@@ -42,9 +42,10 @@ from nitric.proto.apis.v1 import ApiDetailsResponse, ApiDetailsRequest, ApiWorke
 from nitric.context import (
     HttpContext,
     HttpMethod,
+    HttpRequest,
 )
 
-from nitric.resources.apis import Method, Route, RouteOptions, Api
+from nitric.resources.apis import Method, Route, RouteOptions, Api, _http_context_to_proto_response
 
 # pylint: disable=protected-access,missing-function-docstring,missing-class-docstring
 
@@ -375,3 +376,26 @@ class ApiTest(IsolatedAsyncioTestCase):
 
         assert len(test_api.routes) == 1
         assert test_api.routes[0].path == "/api/v2/hello"
+
+    def test_http_context_to_proto_response(self):
+        ctx = HttpContext(request=HttpRequest(data=b"", method="GET", path="/", params={}, query={}, headers={}))
+        ctx.res.status = 201
+        ctx.res.headers["X-Single"] = "a"
+        ctx.res.headers["X-Multi"] = ["b", "c"]
+        ctx.res.body = "created"
+
+        response = _http_context_to_proto_response(ctx)
+
+        assert response.status == 201
+        assert response.body == b"created"
+        assert response.headers["X-Single"].value == ["a"]
+        assert response.headers["X-Multi"].value == ["b", "c"]
+
+    def test_http_context_to_proto_response_without_headers(self):
+        ctx = HttpContext(request=HttpRequest(data=b"", method="GET", path="/", params={}, query={}, headers={}))
+
+        response = _http_context_to_proto_response(ctx)
+
+        assert response.status == 200
+        assert response.headers == {}
+        assert ctx.res._headers is None
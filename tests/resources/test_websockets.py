@@ -20,9 +20,23 @@ from unittest import IsolatedAsyncioTestCase
 from unittest.mock import AsyncMock, Mock, patch
 
 from nitric.proto.resources.v1 import Action, PolicyResource, ResourceDeclareRequest, ResourceIdentifier, ResourceType
-from nitric.proto.websockets.v1 import WebsocketSendRequest
+from nitric.context import (
+    WebsocketConnectionRequest,
+    WebsocketConnectionResponse,
+    WebsocketMessageRequest,
+    WebsocketRequest,
+    WebsocketResponse,
+)
+from nitric.proto.websockets.v1 import (
+    QueryValue,
+    WebsocketConnectionEvent,
+    WebsocketDisconnectionEvent,
+    WebsocketEventRequest,
+    WebsocketMessageEvent,
+    WebsocketSendRequest,
+)
 from nitric.resources import Websocket, websocket
-from nitric.resources.websockets import WebsocketRef
+from nitric.resources.websockets import WebsocketRef, _websocket_context_from_proto
 
 # pylint: disable=protected-access,missing-function-docstring,missing-class-docstring
 
@@ -77,6 +91,37 @@ class WebsocketTest(IsolatedAsyncioTestCase):
             )
         )
 
+    def test_context_from_connection_event(self):
+        ctx = _websocket_context_from_proto(
+            WebsocketEventRequest(
+                connection_id="test-connection",
+                connection=WebsocketConnectionEvent(query_params={"a": QueryValue(value=["b"])}),
+            )
+        )
+
+        assert isinstance(ctx.req, WebsocketConnectionRequest)
+        assert isinstance(ctx.res, WebsocketConnectionResponse)
+        assert ctx.req.connection_id == "test-connection"
+        assert ctx.req.query == {"a": ["b"]}
+
+    def test_context_from_message_event(self):
+        ctx = _websocket_context_from_proto(
+            WebsocketEventRequest(connection_id="test-connection", message=WebsocketMessageEvent(body=b"hello"))
+        )
+
+        assert isinstance(ctx.req, WebsocketMessageRequest)
+        assert ctx.req.connection_id == "test-connection"
+        assert ctx.req.data == b"hello"
+
+    def test_context_from_disconnection_event(self):
+        ctx = _websocket_context_from_proto(
+            WebsocketEventRequest(connection_id="test-connection", disconnection=WebsocketDisconnectionEvent())
+        )
+
+        assert type(ctx.req) is WebsocketRequest
+        assert type(ctx.res) is WebsocketResponse
+        assert ctx.req.connection_id == "test-connection"
+
 
 class WebsocketClientTest(IsolatedAsyncioTestCase):
     async def test_send(self):
@@ -0,0 +1,84 @@
+#
+# Copyright (c) 2021 Nitric Technologies Pty Ltd.
+#
+# This file is part of Nitric Python 3 SDK.
+# See https://github.com/nitrictech/python-sdk for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import importlib
+import json
+import math
+import sys
+
+import pytest
+
+from nitric import _json
+from nitric.context import HttpRequest
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    """Run the test with nitric._json loaded with, and without, orjson available."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    importlib.reload(_json)
+    yield request.param
+    monkeypatch.undo()
+    importlib.reload(_json)
+
+
+def _http_request(data: bytes) -> HttpRequest:
+    return HttpRequest(data=data, method="POST", path="/", params={}, query={}, headers={})
+
+
+def test__dumps_bytes(json_backend):
+    assert json.loads(_json.dumps_bytes({"a": [1, "b"], 2: None})) == {"a": [1, "b"], "2": None}
+
+
+def test__dumps_bytes_large_int(json_backend):
+    value = {"big": 2**70}
+
+    assert json.loads(_json.dumps_bytes(value)) == value
+
+
+def test__dumps_bytes_unserializable(json_backend):
+    with pytest.raises(TypeError):
+        _json.dumps_bytes(object())
+
+
+def test__dumps_bytes_separators(json_backend):
+    expected = b'{"a":1}' if json_backend == "orjson" else b'{"a": 1}'
+
+    assert _json.dumps_bytes({"a": 1}) == expected
+
+
+def test__loads_bytes(json_backend):
+    assert _json.loads(b'{"a": 1}') == {"a": 1}
+
+
+def test__request_json_large_int(json_backend):
+    assert _http_request(b'{"id": 123456789012345678901234567890}').json == {"id": 123456789012345678901234567890}
+
+
+def test__request_json_nan_and_infinity(json_backend):
+    body = _http_request(b'{"nan": NaN, "inf": Infinity}').json
+
+    assert math.isnan(body["nan"])
+    assert body["inf"] == math.inf
+
+
+def test__request_json_lone_surrogate(json_backend):
+    assert _http_request(b'{"s": "\\ud800"}').json == {"s": "\ud800"}
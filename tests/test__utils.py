@@ -18,6 +18,10 @@
 #
 import copy
 
+from betterproto.lib.google.protobuf import Struct
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.struct_pb2 import Struct as WorkingStruct
+
 from nitric.utils import struct_from_dict, dict_from_struct
 
 
@@ -36,3 +40,24 @@ def test__dict_from_struct():
 
     # Serialization and Deserialization shouldn't modify the object in most cases.
     assert dict_from_struct(struct_from_dict(dict_val)) == dict_copy
+
+
+def test__dict_from_struct_matches_message_to_dict():
+    dict_val = {
+        "zero": 0,
+        "empty_string": "",
+        "empty_dict": {},
+        "empty_list": [],
+        "nested_list": [[], [None, {"a": 1.5}]],
+    }
+    struct = Struct().parse(bytes(struct_from_dict(dict_val)))
+
+    gpb_struct = WorkingStruct()
+    gpb_struct.ParseFromString(bytes(struct))
+
+    assert dict_from_struct(struct) == MessageToDict(gpb_struct)
+    assert dict_from_struct(struct) == dict_val
+
+
+def test__dict_from_struct_none():
+    assert dict_from_struct(None) == {}
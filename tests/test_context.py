@@ -0,0 +1,277 @@
+#
+# Copyright (c) 2021 Nitric Technologies Pty Ltd.
+#
+# This file is part of Nitric Python 3 SDK.
+# See https://github.com/nitrictech/python-sdk for further info.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+import sys
+from unittest import IsolatedAsyncioTestCase
+
+import pytest
+
+from nitric.context import (
+    HttpContext,
+    HttpMethod,
+    HttpRequest,
+    HttpResponse,
+    MessageContext,
+    _HANDLER_CACHE,
+    _is_handler,
+    compose_middleware,
+)
+from nitric.proto.topics.v1 import TopicMessage
+from nitric.proto.topics.v1 import MessageRequest as TopicMessageRequest
+from nitric.proto.topics.v1 import ServerMessage as TopicServerMessage
+from nitric.utils import struct_from_dict
+
+
+def _http_request(data: bytes) -> HttpRequest:
+    return HttpRequest(data=data, method="POST", path="/", params={}, query={}, headers={})
+
+
+def test__http_request_json():
+    req = _http_request(b'{"a": 1}')
+
+    assert req.json == {"a": 1}
+    # The parsed body is cached, repeated access returns the same object.
+    assert req.json is req.json
+
+
+def test__http_request_json_invalid():
+    assert _http_request(b"not json").json is None
+    assert _http_request(b"").json is None
+    assert _http_request(b"\xff").json is None
+
+
+def test__http_request_body():
+    req = _http_request(b"hello")
+
+    assert req.body == "hello"
+    assert req.body is req.body
+
+
+def test__http_request_data_reset_clears_cache():
+    req = _http_request(b'{"a": 1}')
+    assert req.json == {"a": 1}
+    assert req.body == '{"a": 1}'
+
+    req.data = b'{"b": 2}'
+
+    assert req.json == {"b": 2}
+    assert req.body == '{"b": 2}'
+
+
+def test__http_response_json_body():
+    res = HttpResponse()
+    res.body = {"a": [1, 2], "b": "c"}
+
+    assert isinstance(res.body, bytes)
+    assert json.loads(res.body) == {"a": [1, 2], "b": "c"}
+    assert res.headers["Content-Type"] == ["application/json"]
+
+
+def test__is_handler():
+    async def handler(ctx):
+        return ctx
+
+    async def middleware(ctx, nxt):
+        return await nxt(ctx)
+
+    async def middleware_with_default(ctx, nxt=None):
+        return ctx
+
+    for _ in range(2):
+        assert _is_handler(handler)
+        assert not _is_handler(middleware)
+        assert _is_handler(middleware_with_default)
+
+    assert _HANDLER_CACHE[handler] is True
+    assert _HANDLER_CACHE[middleware] is False
+
+
+def test__http_method_is_str():
+    assert str(HttpMethod.GET) == "GET"
+    assert f"{HttpMethod.POST}" == "POST"
+    assert HttpMethod.PUT == "PUT"
+    assert HttpMethod("DELETE") is HttpMethod.DELETE
+
+
+def test__http_context_has_no_instance_dict():
+    ctx = HttpContext(request=_http_request(b""))
+
+    assert not hasattr(ctx, "__dict__")
+    assert not hasattr(ctx.req, "__dict__")
+    assert not hasattr(ctx.res, "__dict__")
+
+
+def test__ensure_value_is_list():
+    values = ["a", "b"]
+
+    assert HttpContext._ensure_value_is_list(values) is values
+    assert HttpContext._ensure_value_is_list("a") == ["a"]
+
+
+def test__http_response_headers_are_allocated_on_access():
+    res = HttpResponse()
+    assert not res.has_headers
+    assert res._headers is None
+
+    res.headers["X-Test"] = "value"
+
+    assert res.has_headers
+    assert res.headers == {"X-Test": "value"}
+
+
+def test__http_response_provided_headers():
+    headers = {"X-Test": ["value"]}
+    res = HttpResponse(headers=headers)
+
+    assert res.headers is headers
+
+
+def test__message_context_from_request_interns_topic():
+    topic_name = "".join(["test-", "topic"])
+    msg = TopicServerMessage(
+        message_request=TopicMessageRequest(
+            topic_name=topic_name,
+            message=TopicMessage(struct_payload=struct_from_dict({"a": 1})),
+        )
+    )
+
+    ctx = MessageContext._from_request(msg)
+
+    assert ctx.req.topic is sys.intern(topic_name)
+    assert ctx.req.data == {"a": 1}
+
+
+def test__http_context_rejects_new_attributes():
+    ctx = HttpContext(request=_http_request(b""))
+
+    with pytest.raises(AttributeError):
+        ctx.user = "user-id"
+    with pytest.raises(AttributeError):
+        ctx.req.user = "user-id"
+
+
+class ContextTest(IsolatedAsyncioTestCase):
+    async def test_compose_middleware(self):
+        calls = []
+
+        async def first(ctx, nxt):
+            calls.append("first")
+            return await nxt(ctx)
+
+        async def handler(ctx):
+            calls.append("handler")
+            ctx.res.status = 201
+            return ctx
+
+        async def last(ctx, nxt):
+            calls.append("last")
+            return await nxt(ctx) if nxt else ctx
+
+        composed = compose_middleware(first, handler, last)
+        ctx = HttpContext(request=_http_request(b""))
+
+        for _ in range(2):
+            calls.clear()
+            result = await composed(ctx)
+
+            assert result is ctx
+            assert result.res.status == 201
+            assert calls == ["first", "handler", "last"]
+
+    async def test_compose_middleware_calls_nxt(self):
+        async def handler(ctx):
+            return ctx
+
+        async def outer(ctx):
+            ctx.res.status = 404
+            return ctx
+
+        ctx = HttpContext(request=_http_request(b""))
+        result = await compose_middleware(handler)(ctx, outer)
+
+        assert result.res.status == 404
+
+    async def test_compose_middleware_returns_context_when_middleware_returns_none(self):
+        async def middleware(ctx, nxt):
+            return None
+
+        ctx = HttpContext(request=_http_request(b""))
+
+        assert await compose_middleware(middleware)(ctx) is ctx
+
+    async def test_compose_middleware_nested(self):
+        calls = []
+
+        def recorder(name):
+            async def middleware(ctx, nxt):
+                calls.append(name)
+                return await nxt(ctx) if nxt else ctx
+
+            return middleware
+
+        inner = compose_middleware(recorder("inner-a"), recorder("inner-b"))
+        outer = compose_middleware(recorder("outer-a"), inner, recorder("outer-b"))
+        ctx = HttpContext(request=_http_request(b""))
+
+        for _ in range(2):
+            calls.clear()
+
+            assert await outer(ctx) is ctx
+            assert calls == ["outer-a", "inner-a", "inner-b", "outer-b"]
+
+    async def test_compose_middleware_nested_only_links_reached_middleware(self):
+        calls = []
+
+        async def stop(ctx, nxt):
+            calls.append("stop")
+            return ctx
+
+        async def unreached(ctx, nxt):
+            calls.append("unreached")
+            return await nxt(ctx)
+
+        async def outer_tail(ctx):
+            calls.append("outer_tail")
+            return ctx
+
+        inner = compose_middleware(stop, unreached)
+        ctx = HttpContext(request=_http_request(b""))
+
+        assert await inner(ctx, outer_tail) is ctx
+        assert calls == ["stop"]
+
+    async def test_http_context_subclass_carries_state_through_middleware(self):
+        class AuthContext(HttpContext):
+            def __init__(self, ctx, user):
+                super().__init__(request=ctx.req, response=ctx.res)
+                self.user = user
+
+        async def authenticate(ctx, nxt):
+            return await nxt(AuthContext(ctx, user="user-id"))
+
+        async def handler(ctx):
+            ctx.res.body = ctx.user
+            return ctx
+
+        ctx = HttpContext(request=_http_request(b""))
+        result = await compose_middleware(authenticate, handler)(ctx)
+
+        assert isinstance(result, AuthContext)
+        assert result.res is ctx.res
+        assert ctx.res.body == b"user-id"